@@ -1,16 +1,17 @@
-import os
 import logging
+from log_config import logger
 
-# Logging Configuration
-LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
-LOG_LEVEL = logging.DEBUG
-LOG_DIR = 'log'
-LOG_FILE = os.path.join(LOG_DIR, 'client.log')
 
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
+class _Missing:
+    """
+    Default for dict.get/pop, so a missing key doesn't raise.
+    Pickles by name, so it is still the same object after a round trip through a Manager dict proxy.
+    """
+    def __reduce__(self):
+        return '_MISSING'
+
 
-logging.basicConfig(filename=LOG_FILE, format=LOG_FORMAT, level=LOG_LEVEL)
+_MISSING = _Missing()
 
 
 class Database:
@@ -29,7 +30,8 @@ class Database:
         if not isinstance(db, dict):
             raise ValueError("DB must be a dictionary.")
         self.DB = db
-        logging.info("Database initialized with data: %s", self.DB)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Database initialized with data: %s", self.DB)
 
     def set_value(self, key: int, val: int) -> bool:
         """
@@ -37,15 +39,12 @@ class Database:
 
         :param key: The key to set.
         :param val: The value to set.
-        :return: True if the value was set successfully, False otherwise.
+        :return: True, as setting a dictionary item doesn't fail.
         """
-        try:
-            self.DB[key] = val
-            logging.info("Value set: %d -> %d", key, val)
-            return True
-        except Exception as e:
-            logging.error("Error setting value for key %d: %s", key, e)
-            return False
+        self.DB[key] = val
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Value set: %d -> %s", key, val)
+        return True
 
     def get_value(self, key: int):
         """
@@ -54,13 +53,23 @@ class Database:
         :param key: The key whose value needs to be fetched.
         :return: The value associated with the key, or a message indicating the key doesn't exist.
         """
-        try:
-            value = self.DB[key]
-            logging.info("Fetched value for key %d: %d", key, value)
-            return value
-        except KeyError:
-            logging.warning("Key %d not found in the database.", key)
+        return self._get_from(self.DB, key)
+
+    def _get_from(self, db: dict, key: int):
+        """
+        Look up a key in the given dictionary, which is self.DB unless a subclass reads another version of it.
+
+        :param db: The dictionary to read.
+        :param key: The key whose value needs to be fetched.
+        :return: The value associated with the key, or a message indicating the key doesn't exist.
+        """
+        value = db.get(key, _MISSING)
+        if value is _MISSING:
+            logger.warning("Key %d not found in the database.", key)
             return "doesn't exist"
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Fetched value for key %d: %s", key, value)
+        return value
 
     def del_value(self, key: int) -> bool:
         """
@@ -69,10 +78,9 @@ class Database:
         :param key: The key to delete.
         :return: True if the key was deleted successfully, False otherwise.
         """
-        try:
-            del self.DB[key]
-            logging.info("Deleted key %d from database.", key)
-            return True
-        except KeyError:
-            logging.warning("Key %d not found for deletion.", key)
+        if self.DB.pop(key, _MISSING) is _MISSING:
+            logger.warning("Key %d not found for deletion.", key)
             return False
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Deleted key %d from database.", key)
+        return True
@@ -0,0 +1,98 @@
+from array import array
+from Database import Database
+import logging
+from log_config import logger
+
+SENTINEL = -2 ** 63  # Marks an empty slot; this value itself is kept in the overflow dict
+INT64_MAX = 2 ** 63 - 1
+MAX_SLOTS_PER_KEY = 4  # The default capacity allocates at most this many slots per initial key
+
+
+class ArrayDatabase(Database):
+    """
+    A subclass of Database for integer keys in a dense range.
+    Keys 0..capacity-1 with 64-bit integer values are stored in a packed array
+    (8 bytes per entry, direct indexing instead of hashing).
+    Anything else, including keys past the array, falls back to the regular dictionary in self.DB.
+    """
+    def __init__(self, db: dict, capacity: int = None):
+        """
+        Initialize the ArrayDatabase with a dictionary.
+
+        :param db: A dictionary representing the database.
+        :param capacity: Number of array slots; defaults to one past the largest non-negative int key in db,
+            capped at MAX_SLOTS_PER_KEY slots per key in db so a few large keys can't allocate a huge array.
+        :raises ValueError: If db is not a dictionary.
+        """
+        super().__init__({})
+        if not isinstance(db, dict):
+            raise ValueError("DB must be a dictionary.")
+        if capacity is None:
+            capacity = max((k + 1 for k in db if isinstance(k, int) and k >= 0), default=0)
+            capacity = min(capacity, MAX_SLOTS_PER_KEY * len(db))
+        self.capacity = capacity
+        self.values = array('q', [SENTINEL]) * capacity
+        for key, val in db.items():
+            self._store(key, val)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Array database initialized with capacity %d and %d overflow keys", capacity, len(self.DB))
+
+    def _in_array(self, key) -> bool:
+        """
+        Check whether a key has a slot in the array.
+        """
+        return type(key) is int and 0 <= key < self.capacity
+
+    def _store(self, key, val):
+        """
+        Store a value in the array if it fits there, otherwise in the overflow dictionary.
+        """
+        if self._in_array(key):
+            if type(val) is int and SENTINEL < val <= INT64_MAX:
+                self.values[key] = val
+                self.DB.pop(key, None)
+                return
+            self.values[key] = SENTINEL
+        self.DB[key] = val
+
+    def set_value(self, key: int, val: int) -> bool:
+        """
+        Set a key-value pair in the database.
+
+        :param key: The key to set.
+        :param val: The value to set.
+        :return: True if the value was set successfully.
+        """
+        self._store(key, val)
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Value set: %d -> %s", key, val)
+        return True
+
+    def get_value(self, key: int):
+        """
+        Get the value associated with a key from the database.
+
+        :param key: The key whose value needs to be fetched.
+        :return: The value associated with the key, or a message indicating the key doesn't exist.
+        """
+        if self._in_array(key):
+            value = self.values[key]
+            if value != SENTINEL:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Fetched value for key %d: %s", key, value)
+                return value
+        return super().get_value(key)
+
+    def del_value(self, key: int) -> bool:
+        """
+        Delete a key-value pair from the database.
+
+        :param key: The key to delete.
+        :return: True if the key was deleted successfully, False otherwise.
+        """
+        if self._in_array(key) and self.values[key] != SENTINEL:
+            self.values[key] = SENTINEL
+            if __debug__ and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Deleted key %d from database.", key)
+            return True
+        return super().del_value(key)
@@ -0,0 +1,133 @@
+from file_Database import FileDatabase
+from sync_Database import LockCounters
+import asyncio
+from log_config import logger
+
+
+class AsyncSynchronizedDatabase(FileDatabase):
+    """
+    A subclass of FileDatabase that synchronizes asyncio tasks sharing one event loop.
+    It offers the same reader-writer lock as SynchronizedDatabase, built on asyncio primitives,
+    so many concurrent operations cost a task each instead of a thread or a process.
+    """
+    def __init__(self, db: dict, max_readers=10):
+        """
+        Initialize the AsyncSynchronizedDatabase.
+
+        :param db: A dictionary representing the initial database.
+        :param max_readers: The maximum number of readers allowed to access the database concurrently.
+        """
+        super().__init__(db)
+        self.max_readers = max_readers
+        # Reader-writer lock state, guarded by self.condition. Writers get priority over new readers.
+        self.condition = asyncio.Condition()
+        self.counters = LockCounters()
+        logger.info("Asyncio mode enabled with max readers: %d", max_readers)
+
+    async def acquire_read_lock(self):
+        """
+        Acquire the read lock to allow concurrent readers.
+        Waits while a writer holds or is waiting for the lock, or max_readers are already inside.
+        """
+        logger.debug("Acquiring read lock.")
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.counters.reader_may_enter(self.max_readers))
+            self.counters.readers += 1
+
+    async def release_read_semaphore(self):
+        """
+        Release the read lock after reading from the database.
+        """
+        logger.debug("Releasing read semaphore.")
+        async with self.condition:
+            if self.counters.reader_left(self.max_readers):
+                self.condition.notify_all()
+
+    async def acquire_write_lock(self):
+        """
+        Acquire the write lock to ensure exclusive access to the database for writing.
+        """
+        logger.debug("Acquiring write lock.")
+        async with self.condition:
+            self.counters.writers_waiting += 1
+            try:
+                await self.condition.wait_for(self.counters.writer_may_enter)
+            finally:
+                self.counters.writers_waiting -= 1
+                if not self.counters.writers_waiting:
+                    self.condition.notify_all()  # Readers held back only by this writer, if it was cancelled
+            self.counters.writing = True
+
+    async def release_write_lock(self):
+        """
+        Release the write lock after writing to the database.
+        """
+        logger.debug("Releasing write lock.")
+        async with self.condition:
+            self.counters.writing = False
+            self.condition.notify_all()
+
+    async def set_value(self, key: int, value: int) -> bool:
+        """
+        Set a key-value pair in the database with synchronization.
+
+        :param key: The key to set.
+        :param value: The value to set.
+        :return: True if the value was set successfully, False otherwise.
+        """
+        await self.acquire_write_lock()
+        try:
+            return super().set_value(key, value)
+        finally:
+            await self.release_write_lock()
+
+    async def bulk_set(self, pairs) -> bool:
+        """
+        Set several key-value pairs under a single write lock acquisition and save.
+
+        :param pairs: An iterable of (key, value) pairs.
+        :return: True if all the values were set successfully, False otherwise.
+        """
+        await self.acquire_write_lock()
+        try:
+            return super().bulk_set(pairs)
+        finally:
+            await self.release_write_lock()
+
+    async def get_value(self, key: int):
+        """
+        Get the value associated with a key from the database with synchronization.
+
+        :param key: The key whose value needs to be fetched.
+        :return: The value associated with the key.
+        """
+        await self.acquire_read_lock()
+        try:
+            return super().get_value(key)
+        finally:
+            await self.release_read_semaphore()
+
+    async def delete_value(self, key: int) -> bool:
+        """
+        Delete a key-value pair from the database with synchronization.
+
+        :param key: The key to delete.
+        :return: True if the key was deleted successfully, False otherwise.
+        """
+        await self.acquire_write_lock()
+        try:
+            return super().del_value(key)
+        finally:
+            await self.release_write_lock()
+
+    async def snapshot(self) -> dict:
+        """
+        Get a copy of the whole database under a single read lock acquisition.
+
+        :return: A dictionary with all the key-value pairs.
+        """
+        await self.acquire_read_lock()
+        try:
+            return self.DB.copy()
+        finally:
+            await self.release_read_semaphore()
@@ -0,0 +1,98 @@
+import asyncio
+from log_config import logger
+from async_Database import AsyncSynchronizedDatabase
+
+MAX_READERS = 10
+READERS_NUM = 10
+WRITERS_NUM = 20
+DELETERS_NUM = 5
+DATABASE_LENGTH = 20
+
+
+async def reader_work(sync_db, key):
+    """
+    Simulate a reader task that retrieves a value from the database.
+
+    :param sync_db: The synchronized database instance.
+    :param key: The key to retrieve from the database.
+    """
+    try:
+        value = await sync_db.get_value(key)
+        logger.info("Reader got key %d: %s", key, value)
+    except Exception as e:
+        logger.error("Error in reader task for key %d: %s", key, e)
+
+
+async def writer_work(sync_db, key, value):
+    """
+    Simulate a writer task that sets a value in the database.
+
+    :param sync_db: The synchronized database instance.
+    :param key: The key to set.
+    :param value: The value to set.
+    """
+    try:
+        await sync_db.set_value(key, value)
+        logger.info("Writer set key %d to %d", key, value)
+    except Exception as e:
+        logger.error("Error in writer task for key %d with value %d: %s", key, value, e)
+
+
+async def deleter_work(sync_db, key):
+    """
+    Simulate a deleter task that removes a key-value pair from the database.
+
+    :param sync_db: The synchronized database instance.
+    :param key: The key to delete.
+    """
+    try:
+        success = await sync_db.delete_value(key)
+        if success:
+            logger.info("Deleter removed key %d", key)
+        else:
+            logger.warning("Deleter tried to remove key %d but it does not exist", key)
+    except Exception as e:
+        logger.error("Error in deleter task for key %d: %s", key, e)
+
+
+async def assert_synchronizer_asyncio():
+    """
+    Test the synchronization of multiple asyncio tasks (readers, writers, deleters) accessing the database.
+
+    - Readers retrieve values from the database.
+    - Writers set values in the database.
+    - Deleters remove key-value pairs from the database.
+
+    This function creates a task for each operation (reading, writing, deleting) on a single event loop
+    and waits for all of them to finish. It logs the actions and any errors encountered.
+    """
+    try:
+        db = {i: i + 20 for i in range(DATABASE_LENGTH)}
+        sync_db = AsyncSynchronizedDatabase(db, max_readers=MAX_READERS)
+
+        tasks = []
+
+        for i in range(READERS_NUM):
+            index = i % DATABASE_LENGTH
+            tasks.append(reader_work(sync_db, index))
+
+        for i in range(WRITERS_NUM):
+            index = (i % (DATABASE_LENGTH // 2)) + (DATABASE_LENGTH // 2)
+            tasks.append(writer_work(sync_db, index, i))
+
+        for i in range(DELETERS_NUM):
+            index = i % DATABASE_LENGTH
+            tasks.append(deleter_work(sync_db, index))
+
+        await asyncio.gather(*tasks)
+
+        final_state = await sync_db.snapshot()  # One read lock for the whole check
+        for i in range(DATABASE_LENGTH):
+            logger.info("Final state - Key %d: Value %s", i, final_state.get(i, "doesn't exist"))
+
+    except Exception as e:
+        logger.error("Error during synchronization test: %s", e)
+
+
+if __name__ == "__main__":
+    asyncio.run(assert_synchronizer_asyncio())
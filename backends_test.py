@@ -0,0 +1,67 @@
+import os
+import tempfile
+from log_config import logger
+from array_Database import ArrayDatabase, SENTINEL, MAX_SLOTS_PER_KEY
+from sqlite_Database import SqliteDatabase
+
+DATABASE_LENGTH = 20
+
+
+def assert_array_database():
+    """
+    Test that ArrayDatabase keeps dense int keys in the array and everything else in the overflow dict.
+    """
+    db = {i: i + 20 for i in range(DATABASE_LENGTH)}
+    array_db = ArrayDatabase(db)
+    assert array_db.capacity == DATABASE_LENGTH and not array_db.DB, "dense keys didn't go to the array"
+    assert all(array_db.get_value(i) == i + 20 for i in range(DATABASE_LENGTH)), "array values were lost"
+
+    array_db.set_value(3, 'x')  # Not an int: the slot is emptied and the value overflows
+    array_db.set_value(4, SENTINEL)  # Marks empty slots, so it can't live in the array
+    array_db.set_value(5, 2 ** 70)  # Doesn't fit 64 bits
+    assert array_db.get_value(3) == 'x' and array_db.get_value(4) == SENTINEL and array_db.get_value(5) == 2 ** 70, \
+        "overflow values were lost"
+    array_db.set_value(3, 30)  # Back into the array
+    assert array_db.get_value(3) == 30 and 3 not in array_db.DB, "a value didn't move back to the array"
+
+    assert array_db.del_value(6) and array_db.get_value(6) == "doesn't exist", "an array key wasn't deleted"
+    assert array_db.del_value(5) and not array_db.del_value(5), "an overflow key wasn't deleted once"
+
+    sparse_db = ArrayDatabase({10 ** 8: 1, 2: 3})
+    assert sparse_db.capacity <= MAX_SLOTS_PER_KEY * 2, "a large key allocated a huge array"
+    assert sparse_db.get_value(10 ** 8) == 1 and sparse_db.get_value(2) == 3, "sparse values were lost"
+    logger.info("ArrayDatabase passed")
+
+
+def assert_sqlite_database():
+    """
+    Test that SqliteDatabase seeds, changes and persists rows, and reports missing keys.
+    """
+    db = {i: i + 20 for i in range(DATABASE_LENGTH)}
+    sqlite_db = SqliteDatabase(db)
+    try:
+        assert all(sqlite_db.get_value(i) == i + 20 for i in range(DATABASE_LENGTH)), "seeded rows were lost"
+        assert sqlite_db.set_value(3, 300) and sqlite_db.get_value(3) == 300, "a row wasn't updated"
+        assert sqlite_db.set_value(4, 'x') and sqlite_db.get_value(4) == 'x', "a non-int value wasn't stored"
+        assert sqlite_db.del_value(5) and not sqlite_db.del_value(5), "a row wasn't deleted once"
+        assert sqlite_db.get_value(5) == "doesn't exist", "a deleted row is still there"
+    finally:
+        sqlite_db.close()
+
+    sqlite_db = SqliteDatabase({})  # The table isn't empty, so it isn't seeded again
+    try:
+        assert sqlite_db.get_value(3) == 300 and sqlite_db.get_value(5) == "doesn't exist", "changes weren't persisted"
+    finally:
+        sqlite_db.close()
+    logger.info("SqliteDatabase passed")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            assert_array_database()
+            assert_sqlite_database()
+        finally:
+            os.chdir(cwd)
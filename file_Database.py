@@ -1,24 +1,57 @@
 import pickle
+import mmap
 import os
-from Database import Database
-import logging
+import time
+import struct
+import weakref
+from Database import Database, _MISSING
+from log_config import logger
 
-# Logging Configuration
-LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
-LOG_LEVEL = logging.DEBUG
-LOG_DIR = 'log'
-LOG_FILE = os.path.join(LOG_DIR, 'client.log')
+# Write coalescing: changes are flushed once this many keys are dirty or this many seconds passed
+FLUSH_OPS = 16
+FLUSH_INTERVAL = 0.05
+# fsync every snapshot and log append, so a flushed change survives a power loss; False trades that for speed
+FSYNC = True
 
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
+# Change log records: an opcode, the key and (for SET) the value, as little-endian 64-bit ints.
+# A GEN record starts the log with the generation of the snapshot it applies to.
+_SET = 1
+_DEL = 2
+_GEN = 3
+_SET_RECORD = struct.Struct('<Bqq')
+_DEL_RECORD = struct.Struct('<Bq')
+_GEN_RECORD = struct.Struct('<Bq')
+# Snapshots start with a magic and their generation; a bare pickle is an older snapshot of generation 0.
+# They have their own file, so the bare pickle winapi.FileDatabase reads and writes is left alone.
+PICKLE_PATH = 'database.pickle'
+_SNAPSHOT_MAGIC = b'DBSNAP\x00\x01'
+_SNAPSHOT_HEADER = struct.Struct('<8sq')
+COMPACT_BYTES = 64 * 1024  # Rewrite the snapshot and empty the change log once it grows past this
 
-logging.basicConfig(filename=LOG_FILE, format=LOG_FORMAT, level=LOG_LEVEL)
+
+def _flush_at_exit(flush_ref):
+    """
+    Flush a FileDatabase that is still alive at interpreter exit.
+
+    :param flush_ref: A weak reference to the instance's flush method.
+    """
+    flush = flush_ref()
+    if flush is not None:
+        flush()
 
 
 class FileDatabase(Database):
     """
     A subclass of Database that persists data to a file using pickle.
-    The data is saved to a `.pickle` file and can be loaded from the file when needed.
+    The data is saved to a `.snapshot` file (a pickle behind a small header), and later changes are appended to a `.log` file
+    as small fixed-size records. The log is folded back into the snapshot once it grows too long.
+    Each snapshot gets a new generation and the log records which one it belongs to, so a log
+    left over from an older snapshot (by a crash while compacting) is never replayed over a newer one.
+
+    Writes are coalesced (see FLUSH_OPS and FLUSH_INTERVAL): the last changes of a burst stay in memory
+    until the next operation flushes them, flush() is called, the object is collected or the interpreter exits.
+    Every flush costs an fsync (see FSYNC), so callers that flush on each write, like SynchronizedDatabase
+    in multiprocessing mode, pay one per write.
     """
     def __init__(self, db: dict):
         """
@@ -27,49 +60,356 @@ class FileDatabase(Database):
         :param db: A dictionary representing the initial database.
         """
         super().__init__(db)
-        self.file_path = 'database.pickle'  # Path for the pickle file
+        self.file_path = 'database.snapshot'  # Path for the snapshot file
+        self.log_path = 'database.log'  # Path for the change log appended after the snapshot
+        self._log_fd = None  # Opened on the first append
+        self._log_offset = 0  # How much of the change log is reflected in memory
+        self._generation = 0  # Generation of the snapshot the database was loaded from or saved to
+        self._log_generation = 0  # Generation of the change log as far as it was read
+        self._file_stamp = None  # (inode, mtime_ns, size) of the file as last seen by this instance
+        self._dirty = set()  # Keys changed in memory but not yet written to the file
+        self._last_flush = time.monotonic()
         if os.path.exists(self.file_path):
             self.load_from_file()  # Load existing data from file
-        logging.info("File database initialized with file path: %s", self.file_path)
+        elif os.path.exists(PICKLE_PATH):
+            self._import_pickle()
+        # Don't lose a pending batch on interpreter exit, without keeping the object alive until then
+        weakref.finalize(self, _flush_at_exit, weakref.WeakMethod(self.flush))
+        logger.info("File database initialized with file path: %s", self.file_path)
+
+    def __del__(self):
+        """
+        Flush pending changes when the object is collected.
+        """
+        if getattr(self, '_dirty', None):
+            self.flush()
+
+    def __getstate__(self):
+        """
+        Drop the change log descriptor when the object is sent to a spawned process; it is reopened there.
+        """
+        state = self.__dict__.copy()
+        state['_log_fd'] = None
+        return state
 
     def save_to_file(self):
         """
-        Save the current database to a file.
+        Save the current database to a file, as a new snapshot with an empty change log.
+        The snapshot gets a generation newer than the current log's, and only then is the log reset,
+        so a crash in between leaves a log that load_from_file recognizes as stale and skips.
 
         :raises Exception: If there is an error while saving the data to the file.
         """
         try:
-            with open(self.file_path, 'wb') as file:  # Open for binary writing
-                pickle.dump(self.DB, file)  # Save data using pickle
-            logging.info("Database saved to file: %s", self.file_path)
+            data = self._dumps()  # Serialize before touching the file
+            generation = max(self._generation, self._log_header_generation()) + 1
+            header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, generation)
+            # Write a temporary file and rename it over the real one, so a crash mid-write
+            # can never leave a truncated pickle behind
+            tmp_path = self.file_path + '.tmp.' + str(os.getpid())
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+            try:
+                os.write(fd, header)
+                view = memoryview(data)
+                while view:  # One write() for the whole pickle, unless the OS takes it in pieces
+                    view = view[os.write(fd, view):]
+                if FSYNC:
+                    os.fsync(fd)  # The rename below must not become visible before the data
+                stamp = self._stamp(os.fstat(fd))  # Renaming keeps the inode and mtime
+            except BaseException:
+                os.close(fd)
+                os.remove(tmp_path)
+                raise
+            os.close(fd)
+            os.replace(tmp_path, self.file_path)
+            self._generation = generation
+            self._reset_log()  # Until this runs, the log still carries the older generation
+            self._file_stamp = stamp
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+            logger.info("Database saved to file: %s", self.file_path)
         except Exception as e:
-            logging.error("Error saving database to file: %s", e)
+            logger.error("Error saving database to file: %s", e)
+
+    def _reset_log(self):
+        """
+        Empty the change log and start it with the generation of the current snapshot.
+        The log is truncated in place rather than replaced, so descriptors other processes hold stay valid.
+        """
+        if self._log_fd is None:
+            self._log_fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+        os.ftruncate(self._log_fd, 0)
+        os.write(self._log_fd, _GEN_RECORD.pack(_GEN, self._generation))
+        self._log_offset = _GEN_RECORD.size
+        self._log_generation = self._generation
+
+    def _log_header_generation(self) -> int:
+        """
+        Read the generation the change log starts with.
+
+        :return: The generation, or 0 if there is no log or it has no GEN record.
+        """
+        try:
+            with open(self.log_path, 'rb') as file:
+                head = file.read(_GEN_RECORD.size)
+        except FileNotFoundError:
+            return 0
+        if len(head) == _GEN_RECORD.size and head[0] == _GEN:
+            return _GEN_RECORD.unpack(head)[1]
+        return 0
+
+    def _dumps(self) -> bytes:
+        """
+        Serialize the database for saving.
+
+        :return: The pickled database.
+        """
+        return pickle.dumps(self.DB, protocol=pickle.HIGHEST_PROTOCOL)
 
     def load_from_file(self):
         """
-        Load the database from a file.
+        Load the database from a file, then replay the change log on top of it.
+        If the file is the same version we last saved or loaded and nothing changed in memory since,
+        the dictionary already in memory is kept instead of unpickling the same data again,
+        and only the part of the log we haven't seen yet is replayed.
 
         :raises Exception: If there is an error while loading the data from the file.
         """
         try:
             with open(self.file_path, 'rb') as file:  # Open for binary reading
-                self.DB = pickle.load(file)  # Load data using pickle
-            logging.info("Database loaded from file: %s", self.file_path)
+                stamp = self._stamp(os.fstat(file.fileno()))
+                if stamp == self._file_stamp and not self._dirty:
+                    logger.debug("Database file unchanged, keeping loaded data: %s", self.file_path)
+                else:
+                    # Unpickle straight from the page cache instead of reading into a bytes copy first
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        generation, start = 0, 0
+                        if mm[:len(_SNAPSHOT_MAGIC)] == _SNAPSHOT_MAGIC:
+                            _, generation = _SNAPSHOT_HEADER.unpack_from(mm)
+                            start = _SNAPSHOT_HEADER.size
+                        with memoryview(mm)[start:] as view:  # Released before the map is closed
+                            self.DB = pickle.loads(view)
+                    self._file_stamp = stamp
+                    self._generation = self._log_generation = generation
+                    self._log_offset = 0
+                    self._dirty.clear()
+            self._replay_log()
+            logger.info("Database loaded from file: %s", self.file_path)
         except Exception as e:
-            logging.error("Error loading database from file: %s", e)
+            logger.error("Error loading database from file: %s", e)
+
+    def _import_pickle(self):
+        """
+        Take over the data of a bare pickle at PICKLE_PATH, as saved before snapshots had their own file,
+        together with its change log. The first flush writes it to the snapshot file; the pickle is left untouched.
+        """
+        try:
+            with open(PICKLE_PATH, 'rb') as file:
+                self.DB = pickle.load(file)
+        except Exception as e:
+            logger.error("Error importing database from file: %s", e)
+            return
+        self._replay_log()
+        self._dirty.update(self.DB)  # No snapshot yet, so the first flush saves one
+        logger.info("Database imported from file: %s", PICKLE_PATH)
+
+    def _replay_log(self):
+        """
+        Apply the change log records past self._log_offset to the database.
+        Records of a log whose generation differs from the snapshot's are skipped.
+        A torn record at the end (from a crash mid-append) is left for a later replay.
+        """
+        try:
+            with open(self.log_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size < self._log_offset:
+                    self._log_offset = 0  # Reset by another process's compaction; read it from the start
+                file.seek(self._log_offset)
+                data = file.read()
+        except FileNotFoundError:
+            return
+        if self._log_offset == 0 and data:
+            self._log_generation = 0  # Until a GEN record says otherwise, as written before generations
+        pos = 0
+        while pos < len(data):
+            op = data[pos]
+            if op not in (_SET, _DEL, _GEN):
+                logger.error("Unknown change log record %d at offset %d, ignoring the rest of the log: %s",
+                             op, self._log_offset + pos, self.log_path)
+                self._log_offset += len(data)
+                self._log_generation = None  # Matches no snapshot, so the next flush saves one and resets the log
+                return
+            record = _SET_RECORD if op == _SET else _DEL_RECORD  # GEN records have the DEL layout
+            if pos + record.size > len(data):
+                break
+            if op == _GEN:
+                _, self._log_generation = _GEN_RECORD.unpack_from(data, pos)
+            elif self._log_generation != self._generation:
+                pass  # Left over from an older snapshot, which already has these changes
+            elif op == _SET:
+                _, key, val = _SET_RECORD.unpack_from(data, pos)
+                self.DB[key] = val
+            else:
+                _, key = _DEL_RECORD.unpack_from(data, pos)
+                self.DB.pop(key, None)
+            pos += record.size
+        self._log_offset += pos
+        if pos and self._log_generation != self._generation:
+            logger.warning("Skipped change log of generation %s, the snapshot is generation %d: %s",
+                           self._log_generation, self._generation, self.log_path)
+        elif pos:
+            logger.debug("Replayed %d bytes of the change log: %s", pos, self.log_path)
+
+    def _append_log(self) -> bool:
+        """
+        Append one record per dirty key to the change log, in a single write.
+        An empty log gets a GEN record first.
+
+        :return: True if the records were appended, False if a key or value doesn't fit a record.
+        """
+        records = []
+        try:
+            for key in self._dirty:
+                val = self.DB.get(key, _MISSING)
+                if val is _MISSING:
+                    records.append(_DEL_RECORD.pack(_DEL, key))
+                else:
+                    records.append(_SET_RECORD.pack(_SET, key, val))
+        except struct.error:
+            return False
+        if self._log_offset == 0:
+            records.insert(0, _GEN_RECORD.pack(_GEN, self._generation))
+            self._log_generation = self._generation
+        if self._log_fd is None:
+            self._log_fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+        data = b''.join(records)
+        os.write(self._log_fd, data)
+        if FSYNC:
+            os.fsync(self._log_fd)  # Once per flush, however many records it holds
+        end = os.lseek(self._log_fd, 0, os.SEEK_CUR)  # End of the log, our records included
+        if end - len(data) == self._log_offset:
+            self._log_offset = end
+        # Otherwise someone else appended since we last replayed; the next replay reads their records
+        # and ours again, in log order
+        return True
+
+    @staticmethod
+    def _stamp(st: os.stat_result) -> tuple:
+        """
+        Build a stamp identifying a version of the file from its stat result.
+        A save that keeps the size and lands within the filesystem's timestamp granularity,
+        on a reused inode, goes unnoticed; the next change to the file is picked up.
+
+        :param st: The stat result of the file.
+        :return: An (inode, mtime_ns, size) tuple.
+        """
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _stat_file(self):
+        """
+        Get a stamp identifying the current version of the file.
+
+        :return: An (inode, mtime_ns, size) tuple, or None if the file doesn't exist.
+        """
+        try:
+            return self._stamp(os.stat(self.file_path))
+        except FileNotFoundError:
+            return None
+
+    def flush(self):
+        """
+        Write pending changes to the file, if there are any.
+        They are appended to the change log; a full snapshot is written instead when there is none yet,
+        when the log belongs to an older snapshot, when a change doesn't fit a log record,
+        or when the log grew past COMPACT_BYTES.
+        """
+        if not self._dirty:
+            return
+        self._reload_if_changed()  # Write on top of what others flushed, not over it
+        try:
+            if (self._file_stamp is not None and self._log_generation == self._generation
+                    and self._log_size() < COMPACT_BYTES and self._append_log()):
+                self._dirty.clear()
+                self._last_flush = time.monotonic()
+                logger.info("Database changes appended to log: %s", self.log_path)
+                return
+        except OSError as e:
+            logger.error("Error appending to change log, saving a snapshot instead: %s", e)
+        self.save_to_file()
+
+    def _mark_dirty(self, key: int):
+        """
+        Record a changed key, and flush once enough changes piled up or enough time passed.
+
+        :param key: The key that was changed.
+        """
+        self._dirty.add(key)
+        if len(self._dirty) >= FLUSH_OPS or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def _reload_if_changed(self):
+        """
+        Reload the database only if the file was modified by someone else since we last saw it.
+        The in-memory dictionary is otherwise kept as the authoritative state, and pending
+        changes that were not flushed yet are applied again on top of what was reloaded.
+        """
+        stamp = self._stat_file()
+        if stamp is None:
+            return
+        if stamp != self._file_stamp:
+            pending = {key: self.DB.get(key, _MISSING) for key in self._dirty}
+            self.load_from_file()
+        elif self._log_size() != self._log_offset:
+            pending = {key: self.DB.get(key, _MISSING) for key in self._dirty}
+            self._replay_log()  # Only the records appended since we last looked
+        else:
+            return
+        for key, val in pending.items():
+            if val is _MISSING:
+                self.DB.pop(key, None)
+            else:
+                self.DB[key] = val
+            self._dirty.add(key)  # load_from_file forgets them
+
+    def _log_size(self) -> int:
+        """
+        Get the size of the change log.
+
+        :return: The size in bytes, or 0 if there is no change log.
+        """
+        try:
+            return os.stat(self.log_path).st_size
+        except FileNotFoundError:
+            return 0
 
     def set_value(self, key: int, val: int) -> bool:
         """
-        Set a key-value pair in the database, then save it to the file.
+        Set a key-value pair in the database, then schedule it to be saved to the file.
 
         :param key: The key to set.
         :param val: The value to set.
-        :return: True if the value was set and saved successfully, False otherwise.
+        :return: True if the value was set successfully, False otherwise.
         """
-        self.load_from_file()  # Load the latest data before setting the value
+        self._reload_if_changed()  # Pick up writes made by other processes
         success = super().set_value(key, val)
         if success:
-            self.save_to_file()  # Save after setting value
+            self._mark_dirty(key)  # Saved with the next batch
+        return success
+
+    def bulk_set(self, pairs) -> bool:
+        """
+        Set several key-value pairs, then write them to the file in a single write.
+
+        :param pairs: An iterable of (key, value) pairs.
+        :return: True if all the values were set successfully, False otherwise.
+        """
+        self._reload_if_changed()  # Pick up writes made by other processes
+        success = True
+        for key, val in pairs:
+            if super().set_value(key, val):
+                self._dirty.add(key)
+            else:
+                success = False
+        self.flush()
         return success
 
     def get_value(self, key: int):
@@ -79,18 +419,18 @@ class FileDatabase(Database):
         :param key: The key whose value needs to be fetched.
         :return: The value associated with the key.
         """
-        self.load_from_file()  # Load the latest data before fetching the value
+        self._reload_if_changed()  # Cheap stat; only unpickles if another process wrote
         return super().get_value(key)
 
     def del_value(self, key: int) -> bool:
         """
-        Delete a key-value pair from the database, then save it to the file.
+        Delete a key-value pair from the database, then schedule the change to be saved to the file.
 
         :param key: The key to delete.
-        :return: True if the key was deleted successfully and saved to the file, False otherwise.
+        :return: True if the key was deleted successfully, False otherwise.
         """
-        self.load_from_file()  # Load the latest data before deletion
+        self._reload_if_changed()  # Pick up writes made by other processes
         success = super().del_value(key)
         if success:
-            self.save_to_file()  # Save after deleting value
+            self._mark_dirty(key)  # Saved with the next batch
         return success
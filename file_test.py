@@ -0,0 +1,175 @@
+import os
+import pickle
+import tempfile
+import file_Database
+from log_config import logger
+from file_Database import FileDatabase
+
+DATABASE_LENGTH = 20
+
+
+def fresh_database() -> FileDatabase:
+    """
+    Create a FileDatabase with a snapshot of DATABASE_LENGTH keys and an empty change log.
+
+    :return: The database instance.
+    """
+    for path in ('database.snapshot', 'database.pickle', 'database.log'):
+        if os.path.exists(path):
+            os.remove(path)
+    file_db = FileDatabase({i: i + 20 for i in range(DATABASE_LENGTH)})
+    file_db.set_value(0, 20)
+    file_db.flush()  # No snapshot yet, so this writes one
+    return file_db
+
+
+def assert_log_replay():
+    """
+    Test that changes appended to the change log are replayed by a new instance.
+    """
+    file_db = fresh_database()
+    file_db.set_value(1, 100)
+    file_db.del_value(2)
+    file_db.flush()
+    assert os.path.getsize('database.log') > 0, "changes were not appended to the log"
+    reloaded = FileDatabase({})
+    assert reloaded.get_value(1) == 100, "a SET record was not replayed"
+    assert reloaded.get_value(2) == "doesn't exist", "a DEL record was not replayed"
+    logger.info("Log replay passed")
+
+
+def assert_torn_tail():
+    """
+    Test that a record cut short by a crash mid-append is ignored, and picked up once it is complete.
+    """
+    file_db = fresh_database()
+    file_db.set_value(1, 100)
+    file_db.flush()
+    record = file_Database._SET_RECORD.pack(file_Database._SET, 3, 300)
+    with open('database.log', 'ab') as file:
+        file.write(record[:5])
+    reloaded = FileDatabase({})
+    assert reloaded.get_value(1) == 100, "records before the torn one were not replayed"
+    assert reloaded.get_value(3) == 23, "the torn record was applied"
+    with open('database.log', 'ab') as file:
+        file.write(record[5:])
+    assert reloaded.get_value(3) == 300, "the completed record was not replayed"
+    logger.info("Torn tail record passed")
+
+
+def assert_corrupt_record():
+    """
+    Test that an unknown record stops the replay instead of being applied,
+    and that the next flush replaces the corrupt log.
+    """
+    file_db = fresh_database()
+    file_db.set_value(1, 100)
+    file_db.flush()
+    with open('database.log', 'ab') as file:
+        file.write(bytes([7]) + (4).to_bytes(8, 'little'))
+    reloaded = FileDatabase({})
+    assert reloaded.get_value(1) == 100, "records before the corrupt one were not replayed"
+    assert reloaded.get_value(4) == 24, "the corrupt record was applied"
+    reloaded.set_value(2, 200)
+    reloaded.flush()
+    reloaded = FileDatabase({})
+    assert reloaded.get_value(1) == 100 and reloaded.get_value(2) == 200, "changes after the corrupt record were lost"
+    logger.info("Corrupt record passed")
+
+
+def assert_compaction():
+    """
+    Test that a log grown past COMPACT_BYTES is folded into a new snapshot, without losing changes.
+    """
+    compact_bytes = file_Database.COMPACT_BYTES
+    file_Database.COMPACT_BYTES = 1024
+    try:
+        file_db = fresh_database()
+        for i in range(200):
+            file_db.set_value(i % DATABASE_LENGTH, i)
+            file_db.flush()
+        assert os.path.getsize('database.log') <= 1024 + file_Database._SET_RECORD.size, "the log was not compacted"
+        expected = file_db.DB.copy()
+        assert FileDatabase({}).DB == expected, "compaction lost changes"
+    finally:
+        file_Database.COMPACT_BYTES = compact_bytes
+    logger.info("Compaction passed")
+
+
+def assert_concurrent_instances():
+    """
+    Test that two instances with pending changes don't lose each other's flushed writes,
+    whether they are appended to the log or saved in a snapshot.
+    """
+    first = fresh_database()
+    second = FileDatabase({})
+    first.set_value(1, 100)  # Pending while the second instance flushes
+    second.set_value(3, 300)
+    second.flush()
+    first.flush()
+    assert first.get_value(3) == 300, "a record appended by another instance was skipped"
+    first.set_value(4, 2 ** 70)  # Forces a snapshot built from the first instance's dict
+    second.set_value(5, 500)
+    second.flush()
+    first.flush()
+    reloaded = FileDatabase({})
+    assert (reloaded.get_value(1), reloaded.get_value(3), reloaded.get_value(4), reloaded.get_value(5)) == \
+        (100, 300, 2 ** 70, 500), "a snapshot erased another instance's writes"
+    logger.info("Concurrent instances passed")
+
+
+def assert_pickle_import():
+    """
+    Test that a bare pickle from before snapshots had their own file is imported with its change log,
+    and is left readable for winapi.FileDatabase.
+    """
+    fresh_database()
+    os.remove('database.snapshot')
+    with open('database.pickle', 'wb') as file:
+        pickle.dump({1: 10, 2: 20}, file)
+    with open('database.log', 'wb') as file:  # Written before logs had a GEN record
+        file.write(file_Database._SET_RECORD.pack(file_Database._SET, 3, 30))
+    imported = FileDatabase({})
+    assert imported.DB == {1: 10, 2: 20, 3: 30}, "the pickle or its log wasn't imported"
+    imported.flush()
+    assert FileDatabase({}).DB == {1: 10, 2: 20, 3: 30}, "the import wasn't saved as a snapshot"
+    with open('database.pickle', 'rb') as file:
+        assert pickle.load(file) == {1: 10, 2: 20}, "the bare pickle was modified"
+    logger.info("Pickle import passed")
+
+
+def assert_stale_log_after_crash():
+    """
+    Test that a log left behind by a crash between publishing a snapshot and resetting the log
+    is not replayed over the newer snapshot.
+    """
+    file_db = fresh_database()
+    file_db.set_value(1, 100)
+    file_db.flush()  # Appended to the log
+    file_db._reset_log = lambda: None  # Crash right after the snapshot is published
+    file_db.set_value(1, 2 ** 70)  # Doesn't fit a log record, so this writes a snapshot
+    file_db.flush()
+    reloaded = FileDatabase({})
+    assert reloaded.get_value(1) == 2 ** 70, "the stale log was replayed over the snapshot"
+    reloaded.set_value(2, 5)
+    reloaded.flush()  # Must not append behind the stale records
+    reloaded = FileDatabase({})
+    assert reloaded.get_value(1) == 2 ** 70 and reloaded.get_value(2) == 5, "changes after the crash were lost"
+    logger.info("Stale log after a crash passed")
+
+
+if __name__ == "__main__":
+    file_Database.FSYNC = False  # Nothing here needs to survive a power loss
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            assert_log_replay()
+            assert_torn_tail()
+            assert_corrupt_record()
+            assert_compaction()
+            assert_concurrent_instances()
+            assert_stale_log_after_crash()
+            assert_pickle_import()
+        finally:
+            os.chdir(cwd)
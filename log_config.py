@@ -0,0 +1,41 @@
+import os
+import queue
+import logging
+import multiprocessing.util
+from logging.handlers import QueueHandler, QueueListener
+
+# Logging Configuration, shared by all the modules. Import-time code runs once per interpreter.
+LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
+LOG_LEVEL = logging.getLevelName(os.environ.get('LOG_LEVEL', 'DEBUG').upper())  # e.g. LOG_LEVEL=WARNING for benchmark runs
+if not isinstance(LOG_LEVEL, int):  # getLevelName returns "Level <name>" for unknown names
+    LOG_LEVEL = logging.DEBUG
+LOG_DIR = 'log'
+LOG_FILE = os.path.join(LOG_DIR, 'client.log')
+
+os.makedirs(LOG_DIR, exist_ok=True)
+
+# Callers still merge the message with its args (QueueHandler.prepare), so mutable args are logged as they were;
+# the final formatting and the file write run on a background thread.
+_file_handler = logging.FileHandler(LOG_FILE)
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_queue_handler = QueueHandler(queue.SimpleQueue())
+
+
+def _start_log_listener():
+    """
+    Start the thread draining the log queue, and stop it (flushing what's left) on exit.
+    Runs again in every forked child, which doesn't inherit the parent's thread.
+    """
+    _queue_handler.queue = queue.SimpleQueue()
+    listener = QueueListener(_queue_handler.queue, _file_handler, respect_handler_level=True)
+    listener.start()
+    multiprocessing.util.Finalize(None, listener.stop, exitpriority=0)
+
+
+if not logging.root.handlers:
+    logging.root.addHandler(_queue_handler)
+    logging.root.setLevel(LOG_LEVEL)
+    _start_log_listener()
+    multiprocessing.util.register_after_fork(_queue_handler, lambda handler: _start_log_listener())
+
+logger = logging.getLogger('DB')
@@ -1,6 +1,6 @@
 import multiprocessing
-import logging
 import os
+from log_config import logger
 from sync_Database import SynchronizedDatabase
 
 MAX_READERS = 10
@@ -10,61 +10,64 @@ DELETERS_NUM = 5
 LOOP_TIMES = 10
 DATABASE_LENGTH = 20
 
-LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
-LOG_LEVEL = logging.DEBUG
-LOG_DIR = 'log'
-LOG_FILE = 'client.log'
+sync_db = None  # Set in each pool worker by init_worker
 
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
 
-logging.basicConfig(filename=LOG_FILE, format=LOG_FORMAT, level=LOG_LEVEL)
+def init_worker(db):
+    """
+    Store the synchronized database in the worker process once, so tasks don't send it again.
+
+    :param db: The synchronized database instance.
+    """
+    global sync_db
+    sync_db = db
 
 
-def reader_work(sync_db, key):
+def reader_work(key):
     """
-    Simulate a reader process that retrieves a value from the database.
+    Simulate a reader task, run by a pool worker process, that retrieves a value from the database LOOP_TIMES times.
 
-    :param sync_db: The synchronized database instance.
     :param key: The key to retrieve from the database.
     """
     try:
-        value = sync_db.get_value(key)
-        logging.info("Reader got key %d: %s", key, value)
+        for _ in range(LOOP_TIMES):
+            value = sync_db.get_value(key)
+            logger.info("Reader got key %d: %s", key, value)
     except Exception as e:
-        logging.error("Error in reader process for key %d: %s", key, e)
+        logger.error("Error in reader process for key %d: %s", key, e)
 
 
-def writer_work(sync_db, key, value):
+def writer_work(key, value):
     """
-    Simulate a writer process that sets a value in the database.
+    Simulate a writer task, run by a pool worker process, that sets a value in the database LOOP_TIMES times.
 
-    :param sync_db: The synchronized database instance.
     :param key: The key to set.
     :param value: The value to set.
     """
     try:
-        sync_db.set_value(key, value)
-        logging.info("Writer set key %d to %d", key, value)
+        for _ in range(LOOP_TIMES):
+            sync_db.set_value(key, value)
+            logger.info("Writer set key %d to %d", key, value)
     except Exception as e:
-        logging.error("Error in writer process for key %d with value %d: %s", key, value, e)
+        logger.error("Error in writer process for key %d with value %d: %s", key, value, e)
 
 
-def deleter_work(sync_db, key):
+def deleter_work(key):
     """
-    Simulate a deleter process that removes a key-value pair from the database.
+    Simulate a deleter task, run by a pool worker process, that removes a key-value pair from the database,
+    trying LOOP_TIMES times.
 
-    :param sync_db: The synchronized database instance.
     :param key: The key to delete.
     """
     try:
-        success = sync_db.delete_value(key)
-        if success:
-            logging.info("Deleter removed key %d", key)
-        else:
-            logging.warning("Deleter tried to remove key %d but it does not exist", key)
+        for _ in range(LOOP_TIMES):
+            success = sync_db.delete_value(key)
+            if success:
+                logger.info("Deleter removed key %d", key)
+            else:
+                logger.warning("Deleter tried to remove key %d but it does not exist", key)
     except Exception as e:
-        logging.error("Error in deleter process for key %d: %s", key, e)
+        logger.error("Error in deleter process for key %d: %s", key, e)
 
 
 def assert_synchronizer_multiprocessing():
@@ -75,41 +78,39 @@ def assert_synchronizer_multiprocessing():
     - Writers set values in the database.
     - Deleters remove key-value pairs from the database.
 
-    This function creates multiple processes for each type of operation (reading, writing, deleting),
-    starts them, and then waits for them to finish. It logs the actions and any errors encountered.
+    This function submits tasks for each type of operation (reading, writing, deleting) to a pool of
+    worker processes, which is started once, and then waits for them to finish.
+    It logs the actions and any errors encountered.
     """
     try:
         db = {i: i + 20 for i in range(DATABASE_LENGTH)}
         sync_db = SynchronizedDatabase(db, mode=False, max_readers=MAX_READERS)
 
-        processes = []
-
-        for i in range(READERS_NUM):
-            index = i % DATABASE_LENGTH
-            p = multiprocessing.Process(target=reader_work, args=(sync_db, index))
-            processes.append(p)
-
-        for i in range(WRITERS_NUM):
-            index = (i % (DATABASE_LENGTH // 2)) + (DATABASE_LENGTH // 2)
-            p = multiprocessing.Process(target=writer_work, args=(sync_db, index, i))
-            processes.append(p)
-
-        for i in range(DELETERS_NUM):
-            index = i % DATABASE_LENGTH
-            p = multiprocessing.Process(target=deleter_work, args=(sync_db, index))
-            processes.append(p)
-
-        for process in processes:
-            process.start()
-
-        for process in processes:
-            process.join()
-
+        # Tasks repeat their operation LOOP_TIMES times, so the workers overlap on the lock;
+        # at least two of them, so there is contention even on a single CPU
+        pool = multiprocessing.Pool(processes=max(2, os.cpu_count() or 1), initializer=init_worker, initargs=(sync_db,))
+        try:
+            for i in range(READERS_NUM):
+                index = i % DATABASE_LENGTH
+                pool.apply_async(reader_work, (index,))
+
+            for i in range(WRITERS_NUM):
+                index = (i % (DATABASE_LENGTH // 2)) + (DATABASE_LENGTH // 2)
+                pool.apply_async(writer_work, (index, i))
+
+            for i in range(DELETERS_NUM):
+                index = i % DATABASE_LENGTH
+                pool.apply_async(deleter_work, (index,))
+        finally:
+            pool.close()  # Let the workers exit normally, so their logs are flushed
+            pool.join()
+
+        final_state = sync_db.snapshot()  # One read lock for the whole check
         for i in range(DATABASE_LENGTH):
-            logging.info("Final state - Key %d: Value %s", i, sync_db.get_value(i))
+            logger.info("Final state - Key %d: Value %s", i, final_state.get(i, "doesn't exist"))
 
     except Exception as e:
-        logging.error("Error during synchronization test: %s", e)
+        logger.error("Error during synchronization test: %s", e)
 
 
 if __name__ == "__main__":
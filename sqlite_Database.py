@@ -0,0 +1,93 @@
+import sqlite3
+from Database import Database
+from log_config import logger
+
+
+class SqliteDatabase(Database):
+    """
+    A subclass of Database that persists data to an SQLite file.
+    Unlike FileDatabase, which rewrites the whole pickle on every change, each operation
+    touches a single row. The journal runs in WAL mode, so readers don't block the writer.
+
+    A connection must not be shared across a fork; create the object in the process that uses it.
+    """
+    def __init__(self, db: dict, file_path: str = 'database.db'):
+        """
+        Initialize the SqliteDatabase, seeding the table with db if it is empty.
+
+        :param db: A dictionary representing the initial database.
+        :param file_path: Path for the SQLite file.
+        :raises ValueError: If db is not a dictionary.
+        """
+        # Database.__init__ is not called: the table is the only state, there is no self.DB dict
+        if not isinstance(db, dict):
+            raise ValueError("DB must be a dictionary.")
+        self.file_path = file_path
+        self.conn = sqlite3.connect(self.file_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS kv (k INTEGER PRIMARY KEY, v)")
+        if self.conn.execute("SELECT 1 FROM kv LIMIT 1").fetchone() is None:
+            with self.conn:  # Seed in a single transaction
+                self.conn.execute("BEGIN")
+                self.conn.executemany("INSERT INTO kv (k, v) VALUES (?, ?)", db.items())
+        logger.info("SQLite database initialized with file path: %s", self.file_path)
+
+    def set_value(self, key: int, val: int) -> bool:
+        """
+        Set a key-value pair in the database.
+
+        :param key: The key to set.
+        :param val: The value to set.
+        :return: True if the value was set successfully, False otherwise.
+        """
+        try:
+            self.conn.execute("INSERT OR REPLACE INTO kv (k, v) VALUES (?, ?)", (key, val))
+            logger.info("Value set: %d -> %s", key, val)
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error setting value for key %d: %s", key, e)
+            return False
+
+    def get_value(self, key: int):
+        """
+        Get the value associated with a key from the database.
+
+        :param key: The key whose value needs to be fetched.
+        :return: The value associated with the key, or a message indicating the key doesn't exist.
+        """
+        try:
+            row = self.conn.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Error fetching value for key %d: %s", key, e)
+            return "doesn't exist"
+        if row is None:
+            logger.warning("Key %d not found in the database.", key)
+            return "doesn't exist"
+        logger.info("Fetched value for key %d: %s", key, row[0])
+        return row[0]
+
+    def del_value(self, key: int) -> bool:
+        """
+        Delete a key-value pair from the database.
+
+        :param key: The key to delete.
+        :return: True if the key was deleted successfully, False otherwise.
+        """
+        try:
+            deleted = self.conn.execute("DELETE FROM kv WHERE k = ?", (key,)).rowcount
+        except sqlite3.Error as e:
+            logger.error("Error deleting key %d: %s", key, e)
+            return False
+        if deleted == 0:
+            logger.warning("Key %d not found for deletion.", key)
+            return False
+        logger.info("Deleted key %d from database.", key)
+        return True
+
+    def close(self):
+        """
+        Close the underlying SQLite connection.
+        """
+        self.conn.close()
+        logger.info("SQLite database closed: %s", self.file_path)
@@ -1,19 +1,58 @@
 from file_Database import FileDatabase
-import os
+import ctypes
+import pickle
 import threading
 import multiprocessing
-import logging
+from log_config import logger
 
-# Logging Configuration
-LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
-LOG_LEVEL = logging.DEBUG
-LOG_DIR = 'log'
-LOG_FILE = os.path.join(LOG_DIR, 'client.log')
 
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
+class _LockCountersMixin:
+    """
+    Counters of the reader-writer lock. Every access must hold the lock's condition.
+    """
+    def reader_may_enter(self, max_readers: int) -> bool:
+        """
+        Check whether a new reader may enter: writers get priority over new readers.
+
+        :param max_readers: The maximum number of readers allowed inside at once.
+        :return: True if the reader may enter, False if it has to wait.
+        """
+        return not (self.writing or self.writers_waiting or self.readers >= max_readers)
+
+    def writer_may_enter(self) -> bool:
+        """
+        Check whether a waiting writer may enter.
+
+        :return: True if nobody else is inside, False otherwise.
+        """
+        return not (self.writing or self.readers)
+
+    def reader_left(self, max_readers: int) -> bool:
+        """
+        Count a reader out.
+
+        :param max_readers: The maximum number of readers allowed inside at once.
+        :return: True if waiters must be woken: a writer when the last reader left, or a reader when a slot freed up.
+        """
+        self.readers -= 1
+        return self.readers == 0 or self.readers == max_readers - 1
+
+
+class LockCounters(_LockCountersMixin):
+    """
+    Reader-writer lock counters for threads or tasks of a single process.
+    """
+    def __init__(self):
+        self.readers = 0  # Readers currently inside
+        self.writers_waiting = 0
+        self.writing = False
+
 
-logging.basicConfig(filename=LOG_FILE, format=LOG_FORMAT, level=LOG_LEVEL)
+class SharedLockCounters(_LockCountersMixin, ctypes.Structure):
+    """
+    Reader-writer lock counters for processes; allocate with multiprocessing.RawValue to put them in shared memory.
+    """
+    _fields_ = [('readers', ctypes.c_int), ('writers_waiting', ctypes.c_int), ('writing', ctypes.c_bool)]
 
 
 class SynchronizedDatabase(FileDatabase):
@@ -28,62 +67,115 @@ class SynchronizedDatabase(FileDatabase):
         :param db: A dictionary representing the initial database.
         :param mode: If True, use threading for synchronization; otherwise, use multiprocessing.
         :param max_readers: The maximum number of readers allowed to access the database concurrently.
+
+        In multiprocessing mode the data lives in a multiprocessing.Manager dict shared by all processes,
+        and the file is only written for persistence.
+        In threading mode writers copy the dict and publish the new one when they are done,
+        so readers never take a lock: a published dict is never modified again.
         """
         super().__init__(db)
         self.mode = mode
         self.max_readers = max_readers
+        # Reader-writer lock state, guarded by self.condition. Writers get priority over new readers.
         if mode:
-            self.semaphore = threading.Semaphore(max_readers)
-            self.write_lock = threading.Lock()
-            logging.info("Threading mode enabled with max readers: %d", max_readers)
+            self.condition = threading.Condition()
+            self.counters = LockCounters()
+            self._snapshot_ref = [self.DB]  # The published dict, read without locking
+            logger.info("Threading mode enabled with max readers: %d", max_readers)
         else:
-            self.semaphore = multiprocessing.Semaphore(max_readers)
-            self.write_lock = multiprocessing.Lock()
-            logging.info("Multiprocessing mode enabled with max readers: %d", max_readers)
+            # Share the data itself between processes instead of passing it through the file
+            self._manager = multiprocessing.Manager()
+            self.DB = self._manager.dict(self.DB)
+            self.condition = multiprocessing.Condition()
+            self.counters = multiprocessing.RawValue(SharedLockCounters)  # Guarded by self.condition, no lock of its own
+            logger.info("Multiprocessing mode enabled with max readers: %d", max_readers)
+
+    def __getstate__(self):
+        """
+        Drop the manager when the object is sent to a spawned process; the DB proxy is enough there.
+        """
+        state = super().__getstate__()
+        state.pop('_manager', None)
+        return state
+
+    def _dumps(self) -> bytes:
+        """
+        Serialize the database for saving. A shared dict proxy is copied out first,
+        so the data is saved rather than the proxy.
+
+        :return: The pickled database.
+        """
+        if self.mode:
+            return super()._dumps()
+        return pickle.dumps(self.DB.copy(), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _reload_if_changed(self):
+        """
+        Never reload: every thread or process already works on the same data,
+        so the file can only hold an older copy of it.
+        """
 
     def acquire_read_lock(self):
         """
         Acquire the read lock to allow concurrent readers.
+        Waits while a writer holds or is waiting for the lock, or max_readers are already inside.
         """
         try:
-            logging.debug("Acquiring read lock.")
-            self.semaphore.acquire()
+            logger.debug("Acquiring read lock.")
+            with self.condition:
+                while not self.counters.reader_may_enter(self.max_readers):
+                    self.condition.wait()
+                self.counters.readers += 1
         except Exception as e:
-            logging.error("Error acquiring read lock: %s", e)
+            logger.error("Error acquiring read lock: %s", e)
 
     def release_read_semaphore(self):
         """
         Release the read lock after reading from the database.
         """
         try:
-            logging.debug("Releasing read semaphore.")
-            self.semaphore.release()
+            logger.debug("Releasing read semaphore.")
+            with self.condition:
+                if self.counters.reader_left(self.max_readers):
+                    self.condition.notify_all()
         except Exception as e:
-            logging.error("Error releasing read semaphore: %s", e)
+            logger.error("Error releasing read semaphore: %s", e)
 
     def acquire_write_lock(self):
         """
         Acquire the write lock to ensure exclusive access to the database for writing.
         """
         try:
-            logging.debug("Acquiring write lock.")
-            self.write_lock.acquire()
-            for _ in range(self.max_readers):
-                self.semaphore.acquire()
+            logger.debug("Acquiring write lock.")
+            with self.condition:
+                self.counters.writers_waiting += 1
+                while not self.counters.writer_may_enter():
+                    self.condition.wait()
+                self.counters.writers_waiting -= 1
+                self.counters.writing = True
+            if self.mode:
+                self.DB = self._snapshot_ref[0].copy()  # Write to a private copy, readers keep the old one
         except Exception as e:
-            logging.error("Error acquiring write lock: %s", e)
+            logger.error("Error acquiring write lock: %s", e)
 
     def release_write_lock(self):
         """
-        Release the write lock and all read locks after writing to the database.
+        Release the write lock after writing to the database.
+        In multiprocessing mode pending changes are flushed first, since the process
+        may exit before its batch would otherwise be written. In threading mode they stay
+        coalesced, so the last writes of a burst reach the file with a later flush.
         """
+        if self.mode:
+            self._snapshot_ref[0] = self.DB  # Publish the new version
+        else:
+            self.flush()
         try:
-            logging.debug("Releasing write lock and read semaphores.")
-            for _ in range(self.max_readers):
-                self.semaphore.release()
-            self.write_lock.release()
+            logger.debug("Releasing write lock.")
+            with self.condition:
+                self.counters.writing = False
+                self.condition.notify_all()
         except Exception as e:
-            logging.error("Error releasing write lock: %s", e)
+            logger.error("Error releasing write lock: %s", e)
 
     def set_value(self, key: int, value: int) -> bool:
         """
@@ -99,6 +191,19 @@ class SynchronizedDatabase(FileDatabase):
         finally:
             self.release_write_lock()
 
+    def bulk_set(self, pairs) -> bool:
+        """
+        Set several key-value pairs under a single write lock acquisition and save.
+
+        :param pairs: An iterable of (key, value) pairs.
+        :return: True if all the values were set successfully, False otherwise.
+        """
+        self.acquire_write_lock()
+        try:
+            return super().bulk_set(pairs)
+        finally:
+            self.release_write_lock()
+
     def get_value(self, key: int):
         """
         Get the value associated with a key from the database with synchronization.
@@ -106,6 +211,8 @@ class SynchronizedDatabase(FileDatabase):
         :param key: The key whose value needs to be fetched.
         :return: The value associated with the key.
         """
+        if self.mode:
+            return self._get_from(self._snapshot_ref[0], key)  # No lock, see __init__
         self.acquire_read_lock()
         try:
             return super().get_value(key)
@@ -124,3 +231,17 @@ class SynchronizedDatabase(FileDatabase):
             return super().del_value(key)
         finally:
             self.release_write_lock()
+
+    def snapshot(self) -> dict:
+        """
+        Get a copy of the whole database under a single read lock acquisition.
+
+        :return: A dictionary with all the key-value pairs.
+        """
+        if self.mode:
+            return self._snapshot_ref[0].copy()  # No lock, see __init__
+        self.acquire_read_lock()
+        try:
+            return self.DB.copy()
+        finally:
+            self.release_read_semaphore()
@@ -1,6 +1,5 @@
 import threading
-import logging
-import os
+from log_config import logger
 from sync_Database import SynchronizedDatabase  # Ensure the import matches your project structure
 
 MAX_READERS = 10
@@ -9,16 +8,6 @@ WRITERS_NUM = 20
 DELETERS_NUM = 5
 DATABASE_LENGTH = 20
 
-LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
-LOG_LEVEL = logging.DEBUG
-LOG_DIR = 'log'
-LOG_FILE = 'client.log'
-
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
-
-logging.basicConfig(filename=LOG_FILE, format=LOG_FORMAT, level=LOG_LEVEL)
-
 
 def reader_work(sync_db, key):
     """
@@ -29,9 +18,9 @@ def reader_work(sync_db, key):
     """
     try:
         value = sync_db.get_value(key)
-        logging.info("Reader got key %d: %s", key, value)
+        logger.info("Reader got key %d: %s", key, value)
     except Exception as e:
-        logging.error("Error in reader thread for key %d: %s", key, e)
+        logger.error("Error in reader thread for key %d: %s", key, e)
 
 
 def writer_work(sync_db, key, value):
@@ -44,9 +33,9 @@ def writer_work(sync_db, key, value):
     """
     try:
         sync_db.set_value(key, value)
-        logging.info("Writer set key %d to %d", key, value)
+        logger.info("Writer set key %d to %d", key, value)
     except Exception as e:
-        logging.error("Error in writer thread for key %d with value %d: %s", key, value, e)
+        logger.error("Error in writer thread for key %d with value %d: %s", key, value, e)
 
 
 def deleter_work(sync_db, key):
@@ -59,11 +48,11 @@ def deleter_work(sync_db, key):
     try:
         success = sync_db.delete_value(key)
         if success:
-            logging.info("Deleter removed key %d", key)
+            logger.info("Deleter removed key %d", key)
         else:
-            logging.warning("Deleter tried to remove key %d but it does not exist", key)
+            logger.warning("Deleter tried to remove key %d but it does not exist", key)
     except Exception as e:
-        logging.error("Error in deleter thread for key %d: %s", key, e)
+        logger.error("Error in deleter thread for key %d: %s", key, e)
 
 
 def assert_synchronizer_threading():
@@ -79,7 +68,7 @@ def assert_synchronizer_threading():
     """
     try:
         db = {i: i + 20 for i in range(DATABASE_LENGTH)}
-        sync_db = SynchronizedDatabase(db, mode=False, max_readers=MAX_READERS)
+        sync_db = SynchronizedDatabase(db, mode=True, max_readers=MAX_READERS)
 
         threads = []
 
@@ -104,11 +93,12 @@ def assert_synchronizer_threading():
         for thread in threads:
             thread.join()
 
+        final_state = sync_db.snapshot()  # One read lock for the whole check
         for i in range(DATABASE_LENGTH):
-            logging.info("Final state - Key %d: Value %s", i, sync_db.get_value(i))
+            logger.info("Final state - Key %d: Value %s", i, final_state.get(i, "doesn't exist"))
 
     except Exception as e:
-        logging.error("Error during synchronization test: %s", e)
+        logger.error("Error during synchronization test: %s", e)
 
 
 if __name__ == "__main__":
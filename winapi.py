@@ -3,19 +3,10 @@ import win32con
 import win32event
 import pywintypes
 import pickle
-import os
-import logging
+import threading
+from log_config import logger
 
-# Logging Configuration
-LOG_FORMAT = '%(levelname)s | %(asctime)s | %(message)s'
-LOG_LEVEL = logging.DEBUG
-LOG_DIR = 'log'
-LOG_FILE = os.path.join(LOG_DIR, 'client.log')
-
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
-
-logging.basicConfig(filename=LOG_FILE, format=LOG_FORMAT, level=LOG_LEVEL)
+READER_STRIPES = 4  # Reader mutexes per SynchronizedDatabase; every write waits on all of them
 
 class Database:
     """
@@ -33,7 +24,7 @@ class Database:
         if not isinstance(db, dict):
             raise ValueError("DB must be a dictionary.")
         self.DB = db
-        logging.info("Database initialized with data: %s", self.DB)
+        logger.info("Database initialized with data: %s", self.DB)
 
     def set_value(self, key: int, val: int) -> bool:
         """
@@ -45,10 +36,10 @@ class Database:
         """
         try:
             self.DB[key] = val
-            logging.info("Value set: %d -> %d", key, val)
+            logger.info("Value set: %d -> %d", key, val)
             return True
         except Exception as e:
-            logging.error("Error setting value for key %d: %s", key, e)
+            logger.error("Error setting value for key %d: %s", key, e)
             return False
 
     def get_value(self, key: int):
@@ -60,10 +51,10 @@ class Database:
         """
         try:
             value = self.DB[key]
-            logging.info("Fetched value for key %d: %d", key, value)
+            logger.info("Fetched value for key %d: %d", key, value)
             return value
         except KeyError:
-            logging.warning("Key %d not found in the database.", key)
+            logger.warning("Key %d not found in the database.", key)
             return "doesn't exist"
 
     def del_value(self, key: int) -> bool:
@@ -75,96 +66,86 @@ class Database:
         """
         try:
             del self.DB[key]
-            logging.info("Deleted key %d from database.", key)
+            logger.info("Deleted key %d from database.", key)
             return True
         except KeyError:
-            logging.warning("Key %d not found for deletion.", key)
+            logger.warning("Key %d not found for deletion.", key)
             return False
 
 
 class FileDatabase(Database):
     """
     A subclass of Database that persists data to a file using win32file.
+    The file is opened once and the handle is kept for the lifetime of the object.
+    The handle shares reading and writing, so several instances (or processes) can open the same file.
     """
     def __init__(self, db: dict):
         """
         Initialize the FileDatabase and load existing data from the file if it exists.
 
         :param db: A dictionary representing the initial database.
+        :raises OSError: If the file can't be opened.
         """
         self.filename = "database.pickle"
         self.file_path = 'database.pickle'
+        self.handle = None
 
-        # Create the file if it doesn't exist (using win32file)
+        # Open the file, creating it empty if it doesn't exist (an empty file loads as an empty dict)
         try:
-            handle = win32file.CreateFile(
+            self.handle = win32file.CreateFile(
                 self.file_path,
                 win32con.GENERIC_READ | win32con.GENERIC_WRITE,
-                0,  # Exclusive sharing
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE,  # Don't lock out other instances
                 None,
-                win32con.CREATE_NEW,  # Creates a new file only if it doesn't exist. Otherwise throws an error
+                win32con.OPEN_ALWAYS,  # Opens the file, or creates it if it doesn't exist.
                 win32con.FILE_ATTRIBUTE_NORMAL,
                 None
             )
-            win32file.CloseHandle(handle)
-            with open(self.file_path, 'wb') as file:  # Initialize with empty dict.
-                pickle.dump({}, file)
         except pywintypes.error as e:
-            if e.winerror == 80:  # Error 80 means file already exists
-                pass
-            else:
-                logging.error(f"Error creating file: {e}")
+            logger.error(f"Error opening file: {e}")
+            # Without a handle nothing can be loaded or saved; fail here rather than on a missing self.DB later
+            raise OSError(f"Can't open database file {self.file_path}: {e.strerror}") from e
 
         self.load_from_file()
         super().__init__(self.DB)
-        logging.info("File database initialized with data: %s", self.DB)
+        logger.info("File database initialized with data: %s", self.DB)
+
+    def __del__(self):
+        """
+        Close the file handle.
+        """
+        if self.handle is not None:
+            win32file.CloseHandle(self.handle)
+            self.handle = None
 
     def save_to_file(self):
         """
         Save the current database to a file using win32file.
         """
         try:
-            handle = win32file.CreateFile(
-                self.file_path,
-                win32con.GENERIC_WRITE,
-                0,  # Exclusive sharing
-                None,
-                win32con.OPEN_EXISTING,  # Opens an existing file.
-                win32con.FILE_ATTRIBUTE_NORMAL,
-                None
-            )
-
-            data = pickle.dumps(self.DB)
-            win32file.WriteFile(handle, data)
-            win32file.CloseHandle(handle)
-            logging.info("Database saved to file: %s", self.file_path)
+            data = pickle.dumps(self.DB, protocol=pickle.HIGHEST_PROTOCOL)
+            win32file.SetFilePointer(self.handle, 0, win32file.FILE_BEGIN)
+            win32file.WriteFile(self.handle, data)
+            win32file.SetEndOfFile(self.handle)  # Drop leftovers of a longer previous save
+            logger.info("Database saved to file: %s", self.file_path)
         except Exception as e:
-            logging.error("Error saving database to file: %s", e)
+            logger.error("Error saving database to file: %s", e)
 
     def load_from_file(self):
         """
         Load the database from a file using win32file.
         """
         try:
-            handle = win32file.CreateFile(
-                self.file_path,
-                win32con.GENERIC_READ,
-                0,  # Exclusive sharing
-                None,
-                win32con.OPEN_EXISTING,  # Opens an existing file.
-                win32con.FILE_ATTRIBUTE_NORMAL,
-                None
-            )
-            file_size = os.path.getsize(self.file_path)
+            win32file.SetFilePointer(self.handle, 0, win32file.FILE_BEGIN)
+            file_size = win32file.GetFileSize(self.handle)
             if file_size > 0:
-                (err, data) = win32file.ReadFile(handle, file_size)
+                (err, data) = win32file.ReadFile(self.handle, file_size)
                 self.DB = pickle.loads(data)
             else:
                 self.DB = {} # If file is empty, initialize empty dict.
-            win32file.CloseHandle(handle)
-            logging.info("Database loaded from file: %s", self.file_path)
+            logger.info("Database loaded from file: %s", self.file_path)
         except Exception as e:
-            logging.error("Error loading database from file: %s", e)
+            logger.error("Error loading database from file: %s", e)
 
     def set_value(self, key: int, val: int) -> bool:
         """
@@ -197,56 +178,60 @@ class FileDatabase(Database):
 class SynchronizedDatabase(FileDatabase):
     """
     A subclass of FileDatabase that adds synchronization mechanisms using win32event.
+    Readers are striped over several mutexes, so readers on different stripes never touch shared state;
+    a writer takes every stripe.
+
+    The trade-off: each write costs one wait per stripe plus one for the writer mutex, and two readers
+    that hash to the same stripe run one after the other. More stripes mean fewer reader collisions
+    and slower writes.
     """
-    def __init__(self, db: dict, mode: bool, max_readers=10):
+    def __init__(self, db: dict, mode: bool, max_readers=10, stripes: int = READER_STRIPES):
         """
         Initialize the SynchronizedDatabase.
 
         :param db: Initial database dictionary.
         :param mode: Not used in this implementation (kept for compatibility).
-        :param max_readers: Maximum number of concurrent readers.
+        :param max_readers: Maximum number of concurrent readers (kept for compatibility; the stripes bound it).
+        :param stripes: Number of reader stripe mutexes, independent of max_readers.
         """
         super().__init__(db)
         self.max_readers = max_readers
 
-        self.read_event = win32event.CreateEvent(None, False, True, None)  # Auto-reset event for readers
-        self.write_mutex = win32event.CreateMutex(None, False, None)  # Mutex for writers
-        self.reader_count=0
+        # One mutex per reader stripe; a reader holds its thread's stripe while it reads
+        self.reader_slots = [win32event.CreateMutex(None, False, None) for _ in range(stripes)]
+        self.write_mutex = win32event.CreateMutex(None, False, None)  # Serializes writers
 
-        logging.info("Using win32event for synchronization.")
-        logging.info(f"Max readers: {max_readers}")
+        logger.info("Using win32event for synchronization.")
+        logger.info(f"Max readers: {max_readers}, reader stripes: {stripes}")
+
+    def _reader_slot(self):
+        """Get the stripe mutex of the calling thread."""
+        # Windows thread ids are multiples of 4, so drop the low bits before spreading them
+        return self.reader_slots[(threading.get_ident() >> 2) % len(self.reader_slots)]
 
     def acquire_read_lock(self):
         """Acquire a read lock."""
-        win32event.WaitForSingleObject(self.write_mutex, -1) # wait if writer is in the critical section
-        self.reader_count+=1
-        if self.reader_count == 1: # if its the first reader, lock the resource
-            win32event.WaitForSingleObject(self.read_event, -1)
-        win32event.ReleaseMutex(self.write_mutex) # release the mutex so other readers can enter
-
-        logging.debug("Reader acquired read lock.")
+        win32event.WaitForSingleObject(self._reader_slot(), win32event.INFINITE) # blocked only by a writer or a reader on the same stripe
+        logger.debug("Reader acquired read lock.")
 
     def release_read_semaphore(self):
         """Release the read lock."""
-        win32event.WaitForSingleObject(self.write_mutex, -1) # lock the mutex to decrement the counter safely
-        self.reader_count-=1
-        if self.reader_count == 0: # if its the last reader, release the resource
-            win32event.SetEvent(self.read_event)
-        win32event.ReleaseMutex(self.write_mutex) # release the mutex
-
-        logging.debug("Reader released read lock.")
+        win32event.ReleaseMutex(self._reader_slot())
+        logger.debug("Reader released read lock.")
 
     def acquire_write_lock(self):
         """Acquire a write lock (exclusive access)."""
-        win32event.WaitForSingleObject(self.read_event, -1) # wait for all readers to finish
-        win32event.WaitForSingleObject(self.write_mutex, -1) # lock the resource for the writer
-        logging.debug("Writer acquired write lock.")
+        win32event.WaitForSingleObject(self.write_mutex, win32event.INFINITE) # one writer at a time
+        for slot in self.reader_slots: # take every stripe; a taken stripe already holds off new readers
+            win32event.WaitForSingleObject(slot, win32event.INFINITE)
+        logger.debug("Writer acquired write lock.")
 
     def release_write_lock(self):
         """Release the write lock."""
-        win32event.ReleaseMutex(self.write_mutex) # release the resource
-        win32event.SetEvent(self.read_event) # let the readers know they can continue
-        logging.debug("Writer released write lock.")
+        for slot in reversed(self.reader_slots):
+            win32event.ReleaseMutex(slot)
+        win32event.ReleaseMutex(self.write_mutex)
+        logger.debug("Writer released write lock.")
 
     def set_value(self, key: int, value: int) -> bool:
         """Set a key-value pair with synchronization."""
@@ -273,5 +258,3 @@ class SynchronizedDatabase(FileDatabase):
             self.release_write_lock()
 
 
-
-